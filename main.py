@@ -3,6 +3,8 @@
 import sys
 import pathlib
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from scrapy.utils.log import configure_logging
 from scrapy.crawler import CrawlerProcess
@@ -43,6 +45,16 @@ def get_input(prompt, valid=None, is_num=False):
 # --- ROBUST CONSOLIDATION ---
 
 
+def read_partial(f):
+    if f.stat().st_size == 0:
+        return None
+    try:
+        df = pd.read_csv(f)
+    except:
+        return None
+    return None if df.empty else df
+
+
 def consolidate_data(directory, pattern, target_name, id_col="url"):
     target_path = directory / target_name
     all_files = [f for f in directory.glob(pattern) if f.name != target_name]
@@ -59,15 +71,14 @@ def consolidate_data(directory, pattern, target_name, id_col="url"):
         except:
             pass
 
-    for f in all_files:
-        if f.stat().st_size > 0:
-            try:
-                df = pd.read_csv(f)
-                if not df.empty:
-                    dfs.append(df)
-                    files_to_delete.append(f)
-            except:
-                continue
+    # Reading and parsing the partial files is independent, so overlap them
+    with ThreadPoolExecutor(max_workers=min(8, len(all_files) or 1)) as executor:
+        partials = list(executor.map(read_partial, all_files))
+
+    for f, df in zip(all_files, partials):
+        if df is not None:
+            dfs.append(df)
+            files_to_delete.append(f)
 
     if not dfs:
         return None
@@ -75,12 +86,20 @@ def consolidate_data(directory, pattern, target_name, id_col="url"):
     combined = pd.concat(dfs, ignore_index=True)
 
     if "fetch_date" in combined.columns and not combined.empty:
-        combined["fetch_date"] = pd.to_datetime(combined["fetch_date"], errors="coerce")
+        # Every writer emits ISO dates, so skip per-element format inference
+        combined["fetch_date"] = pd.to_datetime(
+            combined["fetch_date"], format="ISO8601", errors="coerce"
+        )
         combined["fetch_date"] = combined["fetch_date"].fillna(pd.Timestamp.now())
 
-        combined = combined.sort_values("fetch_date", ascending=True)
         before = len(combined)
-        combined = combined.drop_duplicates(subset=[id_col], keep="first")
+        # Keep each id's oldest row with one hash pass, then sort only the
+        # deduplicated rows; ties go to the earliest file read, and rows
+        # missing an id collapse into one, as drop_duplicates did
+        oldest = combined.groupby(id_col, sort=False, dropna=False)[
+            "fetch_date"
+        ].idxmin()
+        combined = combined.loc[oldest].sort_values("fetch_date", kind="stable")
 
         combined["fetch_date"] = combined["fetch_date"].dt.strftime("%Y-%m-%d")
 
@@ -125,29 +144,14 @@ def mode_clean_data():
     if not raw_file.exists():
         return log("No listings_combined.csv found to clean.", False)
 
-    # 1. LOAD & BACKUP
-    df = pd.read_csv(raw_file)
-    df.to_csv(backup_file, index=False)
+    # 1. BACKUP (byte copy, no need to parse the CSV first)
+    shutil.copyfile(raw_file, backup_file)
     log(f"Safety backup created: {backup_file.name}")
 
-    # 2. RUN FULL CLEANING PIPE
+    # 2. RUN FULL CLEANING PIPE, streamed in chunks to bound memory
 
     try:
-        cleaner = DataCleaner(df)
-        # Execute EVERY step in order
-        df_final = (
-            cleaner.extract_sub_location()
-            .fill_missing_house_type()
-            .clean_bathrooms_bedrooms()
-            .extract_properties()
-            .extract_amenities()
-            .extract_facilities()
-            .clean_price()
-            .remove_sale_and_short_term()
-            .select_columns()
-            .clean_locality()
-            .get_df()
-        )
+        df_final = DataCleaner.clean_csv(raw_file)
 
         # 3. SAVE CLEANED VERSION
         df_final.to_csv(clean_file, index=False)
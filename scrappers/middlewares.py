@@ -98,3 +98,19 @@ class ListingscraperDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class PagePoolDownloaderMiddleware:
+    """Let a spider with an `acquire_page` method attach a pooled Playwright
+    page once a browser request reaches the downloader, so pages freed in the
+    meantime are reused. Other spiders pass through untouched."""
+
+    def process_request(self, request, spider):
+        acquire_page = getattr(spider, "acquire_page", None)
+        if (
+            acquire_page
+            and request.meta.get("playwright")
+            and "playwright_page" not in request.meta
+        ):
+            acquire_page(request)
+        return None
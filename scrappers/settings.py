@@ -7,6 +7,8 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+
 # NEW (correct)
 BOT_NAME = "scrappers"
 SPIDER_MODULES = ["scrappers.spiders"]
@@ -96,3 +98,10 @@ DOWNLOAD_HANDLERS = {
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 
 PLAYWRIGHT_LAUNCH_OPTIONS = {"headless": True}
+
+# Reuse a long-lived browser started with `playwright run-server` instead of
+# launching Chromium on every crawl, e.g.
+#   PLAYWRIGHT_WS_ENDPOINT=ws://127.0.0.1:3000/ python main.py
+# Launch options are ignored by scrapy-playwright while connected.
+if os.environ.get("PLAYWRIGHT_WS_ENDPOINT"):
+    PLAYWRIGHT_CONNECT_URL = os.environ["PLAYWRIGHT_WS_ENDPOINT"]
@@ -1,7 +1,12 @@
 import os
 import pathlib
+import re
+import pandas as pd
 import scrapy
-import csv
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from parsel import Selector
+from parsel.csstranslator import HTMLTranslator
 from scrapy_playwright.page import PageMethod
 from datetime import datetime
 import asyncio
@@ -10,6 +15,7 @@ import warnings
 import logging
 import time
 from scrapy import signals
+from twisted.internet import task
 
 # Fix for asyncio event loop errors
 if sys.platform == "win32":
@@ -25,6 +31,79 @@ PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[2]
 SAVE_DIR = PROJECT_ROOT / "outputs" / "data"
 SAVE_DIR.mkdir(parents=True, exist_ok=True)
 
+BED_RE = re.compile(r"bed", re.IGNORECASE)
+BATH_RE = re.compile(r"bath", re.IGNORECASE)
+
+
+def compile_css(query):
+    """Translate a CSS query once into a reusable lxml XPath evaluator."""
+    return etree.XPath(HTMLTranslator().css_to_xpath(query), smart_strings=False)
+
+
+def first_match(xpath, node):
+    """Equivalent of parsel's .get(): first result or None."""
+    result = xpath(node)
+    return result[0] if result else None
+
+
+TITLE_XPATH = compile_css("h1 div::text, .b-advert-title-outer h1::text")
+LOCATION_XPATH = compile_css(".b-advert-info-statistics--region::text")
+ATTRIBUTE_XPATH = compile_css(".b-advert-attribute")
+ATTRIBUTE_KEY_XPATH = compile_css(".b-advert-attribute__key::text")
+ATTRIBUTE_VALUE_XPATH = compile_css(".b-advert-attribute__value::text")
+ICON_DETAILS_XPATH = compile_css(
+    ".b-advert-icon-attribute span::text, .b-advert-icon-attribute__value::text"
+)
+PRICE_XPATH = compile_css(
+    ".b-alt-advert-price-wrapper span.qa-advert-price-view-value::text, "
+    ".b-alt-advert-price-wrapper .qa-advert-price::text, "
+    ".b-alt-advert-price-wrapper div::text"
+)
+DESCRIPTION_XPATH = compile_css(".qa-description-text::text")
+
+
+def strip_or_none(text):
+    return text.strip() if text else None
+
+
+def extract_fields(html):
+    """Pure-CPU field extraction, run in a worker thread off the event loop."""
+    root = Selector(text=html).root
+
+    properties = {}
+    for prop in ATTRIBUTE_XPATH(root):
+        key = first_match(ATTRIBUTE_KEY_XPATH, prop)
+        value = first_match(ATTRIBUTE_VALUE_XPATH, prop)
+        if key and value:
+            properties[key.strip().rstrip(":")] = value.strip()
+
+    house_type, bathrooms, bedrooms = None, None, None
+    for detail in ICON_DETAILS_XPATH(root):
+        if BED_RE.search(detail):
+            bedrooms = detail.strip()
+        elif BATH_RE.search(detail):
+            bathrooms = detail.strip()
+        elif not house_type:
+            house_type = detail.strip()
+
+    if not house_type:
+        house_type = properties.get("Subtype") or properties.get("Type")
+    if not bedrooms:
+        bedrooms = properties.get("Bedrooms")
+    if not bathrooms:
+        bathrooms = properties.get("Bathrooms") or properties.get("Toilets")
+
+    return {
+        "title": strip_or_none(first_match(TITLE_XPATH, root)),
+        "location": strip_or_none(first_match(LOCATION_XPATH, root)),
+        "house_type": house_type,
+        "bathrooms": bathrooms,
+        "bedrooms": bedrooms,
+        "properties": properties,
+        "price": strip_or_none(first_match(PRICE_XPATH, root)),
+        "description": strip_or_none(first_match(DESCRIPTION_XPATH, root)),
+    }
+
 
 class ListingSpider(scrapy.Spider):
     name = "listingspider"
@@ -89,9 +168,13 @@ class ListingSpider(scrapy.Spider):
         else:
             self.csv_path = csv_path
 
+        self.today_str = datetime.now().strftime("%Y-%m-%d")
         self.urls = self.load_urls()
         self.total_listings = len(self.urls)
 
+        # Worker threads for HTML extraction
+        self.executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+
         # UI Tracking Stats
         self.scraped_count = 0
         self.failures = 0
@@ -107,8 +190,13 @@ class ListingSpider(scrapy.Spider):
     def spider_opened(self, spider):
         sys.stdout.write("\n🚀 Starting data scrape...\n")
         sys.stdout.flush()
+        self.progress_loop = task.LoopingCall(self.update_progress)
+        self.progress_loop.start(0.5, now=False)
 
     def spider_closed(self, spider, reason):
+        self.executor.shutdown(wait=False)
+        if self.progress_loop.running:
+            self.progress_loop.stop()
         self.update_progress(force=True)
         duration = time.time() - self.start_time_ts
         print(f"\n\n{'=' * 40}")
@@ -119,27 +207,32 @@ class ListingSpider(scrapy.Spider):
         print(f"{'=' * 40}\n")
 
     def load_urls(self):
-        urls = []
-        today_str = datetime.now().strftime("%Y-%m-%d")
         try:
-            with open(self.csv_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    url = row.get("url", "").strip()
-                    if url:
-                        f_date = row.get("fetch_date")
-                        if not f_date or str(f_date).strip().lower() == "nan":
-                            f_date = today_str
-
-                        urls.append(
-                            {
-                                "url": row["url"].strip(),
-                                "fetch_date": f_date,
-                            }
-                        )
-        except FileNotFoundError:
-            pass  # main.py handles error logging for missing files
-        return urls
+            df = pd.read_csv(
+                self.csv_path,
+                dtype=str,
+                keep_default_na=False,
+                usecols=lambda col: col in ("url", "fetch_date"),
+            )
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return []  # main.py handles error logging for missing files
+
+        if "url" not in df.columns:
+            return []
+
+        urls = df["url"].str.strip()
+        if "fetch_date" in df.columns:
+            dates = df["fetch_date"].str.strip()
+            missing = (dates == "") | (dates.str.lower() == "nan")
+            dates = dates.mask(missing, self.today_str)
+        else:
+            dates = pd.Series(self.today_str, index=df.index)
+
+        has_url = urls != ""
+        return [
+            {"url": url, "fetch_date": f_date}
+            for url, f_date in zip(urls[has_url], dates[has_url])
+        ]
 
     def start_requests(self):
         for url_data in self.urls:
@@ -166,36 +259,9 @@ class ListingSpider(scrapy.Spider):
         page = response.meta.get("playwright_page")
 
         try:
-            title = response.css("h1 div::text, .b-advert-title-outer h1::text").get()
-            location = response.css(".b-advert-info-statistics--region::text").get()
-
-            properties = {}
-            for prop in response.css(".b-advert-attribute"):
-                key = prop.css(".b-advert-attribute__key::text").get()
-                value = prop.css(".b-advert-attribute__value::text").get()
-                if key and value:
-                    properties[key.strip().rstrip(":")] = value.strip()
-
-            house_type, bathrooms, bedrooms = None, None, None
-            icon_details_texts = response.css(
-                ".b-advert-icon-attribute span::text, .b-advert-icon-attribute__value::text"
-            ).getall()
-
-            for detail in icon_details_texts:
-                detail_lower = detail.lower()
-                if "bed" in detail_lower:
-                    bedrooms = detail.strip()
-                elif "bath" in detail_lower:
-                    bathrooms = detail.strip()
-                elif not house_type:
-                    house_type = detail.strip()
-
-            if not house_type:
-                house_type = properties.get("Subtype") or properties.get("Type")
-            if not bedrooms:
-                bedrooms = properties.get("Bedrooms")
-            if not bathrooms:
-                bathrooms = properties.get("Bathrooms") or properties.get("Toilets")
+            fields = await asyncio.get_running_loop().run_in_executor(
+                self.executor, extract_fields, response.text
+            )
 
             amenities = []
             if page:
@@ -212,43 +278,35 @@ class ListingSpider(scrapy.Spider):
                         amenity_texts = await asyncio.gather(
                             *amenity_tasks, return_exceptions=True
                         )
+                        seen = set()
                         for text in amenity_texts:
-                            if isinstance(text, str) and text.strip():
+                            if isinstance(text, str):
                                 amenity_text = text.strip()
-                                if amenity_text not in amenities:
+                                if amenity_text and amenity_text not in seen:
+                                    seen.add(amenity_text)
                                     amenities.append(amenity_text)
                 except Exception:
                     pass
 
-            price = response.css(
-                ".b-alt-advert-price-wrapper span.qa-advert-price-view-value::text, "
-                ".b-alt-advert-price-wrapper .qa-advert-price::text, "
-                ".b-alt-advert-price-wrapper div::text"
-            ).get()
-
-            description = response.css(".qa-description-text::text").get()
-
             self.scraped_count += 1
-            if self.scraped_count % 10 == 0:
-                self.update_progress()
 
             yield {
                 "url": response.url,
-                "description": description.strip() if description else None,
-                "fetch_date": response.meta.get("fetch_date")
-                or datetime.now().strftime("%Y-%m-%d"),
-                "title": title.strip() if title else None,
-                "location": location.strip() if location else None,
-                "house_type": house_type,
-                "bathrooms": bathrooms,
-                "bedrooms": bedrooms,
-                "properties": properties,
+                "description": fields["description"],
+                "fetch_date": response.meta.get("fetch_date") or self.today_str,
+                "title": fields["title"],
+                "location": fields["location"],
+                "house_type": fields["house_type"],
+                "bathrooms": fields["bathrooms"],
+                "bedrooms": fields["bedrooms"],
+                "properties": fields["properties"],
                 "amenities": amenities,
-                "price": price.strip() if price else None,
+                "price": fields["price"],
             }
 
-        except Exception:
+        except Exception as e:
             self.failures += 1
+            self.logger.debug("Error parsing %s: %s", response.url, e, exc_info=True)
         finally:
             if page:
                 await page.close()
@@ -1,14 +1,18 @@
 import os
 import pathlib
 from datetime import datetime
+from urllib.parse import urljoin, urlsplit
 import scrapy
-from scrapy_playwright.page import PageMethod
+from parsel.csstranslator import HTMLTranslator
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import asyncio
 import sys
 import warnings
 import logging
 import time
 from scrapy import signals
+from twisted.internet import task
+from scrapy.utils.response import get_base_url
 
 # Fix for asyncio event loop errors
 if sys.platform == "win32":
@@ -27,6 +31,8 @@ SAVE_DIR.mkdir(parents=True, exist_ok=True)
 class UrlSpider(scrapy.Spider):
     name = "urlspider"
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    page_pool_size = 8
+    LINK_XPATH = HTMLTranslator().css_to_xpath("div.b-advert-listing a::attr(href)")
 
     custom_settings = {
         "DOWNLOAD_HANDLERS": {
@@ -35,8 +41,12 @@ class UrlSpider(scrapy.Spider):
         },
         "TWISTED_REACTOR": "twisted.internet.asyncioreactor.AsyncioSelectorReactor",
         "PLAYWRIGHT_BROWSER_TYPE": "chromium",
-        "PLAYWRIGHT_MAX_CONTEXTS": 8,
-        "PLAYWRIGHT_MAX_PAGES_PER_CONTEXT": 4,
+        "PLAYWRIGHT_MAX_CONTEXTS": 1,
+        "PLAYWRIGHT_MAX_PAGES_PER_CONTEXT": 12,
+        # Hands out pooled pages when a request is downloaded, not when built
+        "DOWNLOADER_MIDDLEWARES": {
+            "scrappers.middlewares.PagePoolDownloaderMiddleware": 543,
+        },
         "PLAYWRIGHT_LAUNCH_OPTIONS": {
             "headless": True,
             "args": [
@@ -103,6 +113,11 @@ class UrlSpider(scrapy.Spider):
         self.failures = 0
         self.start_time = time.time()
 
+        self.page_pool = []
+        # Browser requests still waiting for scrapy-playwright to open a page
+        self.pages_wanted = 0
+        self.seen_urls = set()
+
     @classmethod
     def from_crawler(cls, crawler, *args, **kwargs):
         spider = super(UrlSpider, cls).from_crawler(crawler, *args, **kwargs)
@@ -112,8 +127,12 @@ class UrlSpider(scrapy.Spider):
 
     def spider_opened(self, spider):
         print("\n🚀 Starting scraping...")
+        self.progress_loop = task.LoopingCall(self.update_progress)
+        self.progress_loop.start(0.5, now=False)
 
     def spider_closed(self, spider):
+        if self.progress_loop.running:
+            self.progress_loop.stop()
         self.update_progress(force=True)  # Final UI update
         duration = time.time() - self.start_time
         print(f"\n\n{'=' * 40}")
@@ -125,51 +144,106 @@ class UrlSpider(scrapy.Spider):
         print(f"{'=' * 40}\n")
 
     def start_requests(self):
+        # Plain HTTP first; Playwright only for pages that come back without listings
         for page_num in range(self.startPage, self.maxPage + 1):
             url = self.baseUrl.format(page_num)
             yield scrapy.Request(
                 url=url,
-                meta={
-                    "playwright": True,
-                    "playwright_page_methods": [
-                        PageMethod(
-                            "wait_for_selector", "div.b-advert-listing", timeout=30000
-                        )
-                    ],
-                    "playwright_include_page": True,
-                    "current_page": page_num,
-                },
+                meta={"current_page": page_num},
                 callback=self.parse,
                 errback=self.errback_close_page,
                 dont_filter=True,
             )
 
+    def browser_request(self, request):
+        meta = {
+            "playwright": True,
+            "playwright_context": "default",
+            "playwright_page_goto_kwargs": {"wait_until": "domcontentloaded"},
+            "playwright_include_page": True,
+            "current_page": request.meta["current_page"],
+        }
+        return request.replace(meta=meta, dont_filter=True)
+
+    def acquire_page(self, request):
+        """Pick a page for a browser request as the downloader takes it."""
+        meta = request.meta
+        if self.page_pool:
+            self.stop_waiting(request)
+            # scrapy-playwright navigates an existing page instead of opening one
+            page = self.page_pool.pop()
+            meta["playwright_page"] = page
+            meta.pop("playwright_page_init_callback", None)
+        elif not meta.get("waiting_for_page"):
+            meta["waiting_for_page"] = True
+            self.pages_wanted += 1
+            meta["playwright_page_init_callback"] = self.page_opened
+
+    async def page_opened(self, page, request):
+        self.stop_waiting(request)
+
+    def stop_waiting(self, request):
+        if request.meta.pop("waiting_for_page", False):
+            self.pages_wanted -= 1
+
+    async def release_page(self, page):
+        # Idle pages hold a context page slot, so don't pool while one is wanted
+        if (
+            not self.pages_wanted
+            and len(self.page_pool) < self.page_pool_size
+            and not page.is_closed()
+        ):
+            self.page_pool.append(page)
+        else:
+            await page.close()
+
     async def parse(self, response):
         page = response.meta.get("playwright_page")
         currPage = response.meta["current_page"]
 
         try:
-            links = response.css("div.b-advert-listing a::attr(href)").getall()
-            for href in links:
-                self.successful_scrapes += 1
+            links = response.xpath(self.LINK_XPATH).getall()
+            if not links and not response.meta.get("playwright"):
+                yield self.browser_request(response.request)
+                return
 
-                # Update UI only every 200 found URLs to prevent terminal lag
-                if self.successful_scrapes % 200 == 0:
-                    self.update_progress()
+            if not links and page:
+                try:
+                    await page.wait_for_selector("div.b-advert-listing", timeout=2000)
+                    html = await page.content()
+                    links = scrapy.Selector(text=html).xpath(self.LINK_XPATH).getall()
+                except PlaywrightTimeoutError:
+                    pass
 
+            fetch_date = datetime.now().strftime("%Y-%m-%d")
+            base = get_base_url(response)
+            parts = urlsplit(base)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            new_urls = 0
+            for href in links:
+                if href.startswith("/") and not href.startswith("//"):
+                    url = origin + href
+                else:
+                    url = urljoin(base, href)
+                if url in self.seen_urls:
+                    continue
+                self.seen_urls.add(url)
+                new_urls += 1
                 yield {
-                    "url": response.urljoin(href),
+                    "url": url,
                     "page": currPage,
-                    "fetch_date": datetime.now().strftime("%Y-%m-%d"),
+                    "fetch_date": fetch_date,
                 }
 
+            self.successful_scrapes += new_urls
             self.pages_visited += 1
 
-        except Exception:
+        except Exception as e:
             self.failures += 1
+            self.logger.debug("Error parsing %s: %s", response.url, e, exc_info=True)
         finally:
             if page:
-                await page.close()
+                await self.release_page(page)
 
     def update_progress(self, force=False):
         elapsed = time.time() - self.start_time
@@ -185,7 +259,12 @@ class UrlSpider(scrapy.Spider):
         sys.stdout.flush()
 
     async def errback_close_page(self, failure):
+        if not failure.request.meta.get("playwright"):
+            yield self.browser_request(failure.request)
+            return
+
         self.failures += 1
+        self.stop_waiting(failure.request)
         page = failure.request.meta.get("playwright_page")
         if page:
             await page.close()
@@ -1,31 +1,182 @@
+import numpy as np
 import pandas as pd
 import ast
+import json
 import re
 
 
+SALE_PATTERNS = [
+    "for sale",
+    "on sale",
+    "sale",
+    "sale only",
+    "selling",
+    "sell",
+    "sold",
+    "property for sale",
+    "house for sale",
+    "apartment for sale",
+    "buy",
+    "buyer",
+    "title deed",
+    "deed",
+    "closing",
+    "escrow",
+    "transfer",
+    "down payment",
+    "mortgage",
+    "loan",
+    "financing",
+    "cash only",
+    "investment",
+    "roi",
+    "yield",
+    "capital gain",
+    "airbnb",
+    "air bnb",
+    "booking.com",
+    "vrbo",
+    "short stay",
+    "holiday rental",
+    "vacation rental",
+    "tourist rental",
+    "guesthouse",
+    "guest house",
+]
+PERIOD_PATTERNS = [
+    "per night",
+    "nightly",
+    "per day",
+    "daily",
+    "by the day",
+    "short term",
+    "short-term",
+    "weekly",
+    "per week",
+    "weekend",
+    "airbnb",
+    "air bnb",
+    "business short",
+    "holidays",
+]
+
+
+def minimal_phrases(phrases):
+    """Drop phrases that already contain a shorter phrase."""
+    kept = []
+    for p in sorted(set(phrases), key=len):
+        if not any(q in p for q in kept):
+            kept.append(p)
+    return kept
+
+
+# Plain substring match, so "resale" and "wholesale" are caught by "sale"
+EXCLUDE_RE = re.compile(
+    "|".join(map(re.escape, minimal_phrases(SALE_PATTERNS + PERIOD_PATTERNS))),
+    re.IGNORECASE,
+)
+
+
 class DataCleaner:
-    def __init__(self, df, verbose=True, keep_original_columns=True):
-        self.df = df.copy()
+    categorical_columns = ("house_type", "locality", "loc", "Condition", "Furnishing")
+    input_columns = (
+        "url",
+        "fetch_date",
+        "title",
+        "description",
+        "location",
+        "house_type",
+        "bathrooms",
+        "bedrooms",
+        "properties",
+        "amenities",
+        "price",
+    )
+    dummy_vocabulary = (
+        "24-hour Electricity",
+        "Air Conditioning",
+        "Apartment",
+        "Balcony",
+        "Chandelier",
+        "Dining Area",
+        "Dishwasher",
+        "Hot Water",
+        "Kitchen Cabinets",
+        "Kitchen Shelf",
+        "Microwave",
+        "Pop Ceiling",
+        "Pre-Paid Meter",
+        "Refrigerator",
+        "TV",
+        "Tiled Floor",
+        "Wardrobe",
+        "Wi-Fi",
+    )
+    output_columns = pd.Index(
+        [
+            "url",
+            "fetch_date",
+            "house_type",
+            "bathrooms",
+            "bedrooms",
+            "price",
+            "locality",
+            "Condition",
+            "Furnishing",
+            "Property Size",
+            *dummy_vocabulary,
+        ]
+    )
+    locality_replacements = {
+        "Dworwulu": "Dzorwulu",
+        "Lartebiokoshie": "Lartebiokorshie",
+        "Ashongman Estate": "Ashongman",
+        "Ashoman Estate": "Ashongman",
+        "Old Ashongman": "Ashongman",
+        "Old Ashoman": "Ashongman",
+        "Ashoman": "Ashongman",
+        "Greater Accra": "Other",
+        "Ledzokuku-Krowor": "Teshie",
+        "South Shiashie": "East Legon",
+        "Okponglo": "East Legon",
+        "Little Legon": "East Legon",
+        "Abofu": "Achimota",
+        "Akweteyman": "Achimota",
+        "Banana Inn": "Dansoman",
+        "South La": "Labadi",
+        "Bubuashie": "Kaneshie",
+    }
+    loc_replacements = {
+        "Circle": "Nkrumah Circle",
+        "Anyaa": "Anyaa Market",
+        "Ridge": "Greater Accra Regional Hospital",
+        "Dome": "Dome Market",
+        "Abokobi": "Abokobi Station",
+        "Nungua": "Nungua Central",
+        "Greater Accra": "Accra",
+    }
+
+    def __init__(self, df, verbose=True, keep_original_columns=True, copy=True):
+        # Steps drop rows in place; pass copy=False only for a frame you own
+        self.df = df.copy() if copy else df
         self.verbose = verbose
         self.keep_original_columns = keep_original_columns
+        self.dummy_columns = set()
 
     def _log(self, msg):
         if self.verbose:
             print(f" {msg}")
 
-    @staticmethod
-    def _get_sub_location(loc):
-        """Extract sub-location from location string."""
-        parts = str(loc).split(",")
-        if len(parts) >= 3:
-            return parts[1].strip()
-        return parts[0].strip()
-
     def extract_sub_location(self):
         self._log("📍 Extracting locality from location...")
-        self.df["locality"] = self.df["location"].apply(self._get_sub_location)
-        unique_localities = self.df["locality"].nunique()
-        self._log(f"✅ Extracted {unique_localities} unique localities")
+        # "Region, Locality, City" -> "Locality"; shorter strings keep the first part
+        parts = self.df["location"].astype("string").str.extract(
+            r"(?s)^\s*([^,]*?)\s*(?:,\s*([^,]*?)\s*,.*|,.*)?$"
+        )
+        self.df["locality"] = parts[1].fillna(parts[0])
+        if self.verbose:
+            unique_localities = self.df["locality"].nunique()
+            self._log(f"✅ Extracted {unique_localities} unique localities")
         if not self.keep_original_columns:
             self.df = self.df.drop("location", axis=1)
             self._log("🗑️ Dropped original 'location' column")
@@ -33,9 +184,11 @@ class DataCleaner:
 
     def fill_missing_house_type(self):
         self._log("🏠 Filling missing house types...")
-        missing_count = self.df["house_type"].isna().sum()
+        missing_count = self.df["house_type"].isna().sum() if self.verbose else 0
+        self.df["house_type"] = (
+            self.df["house_type"].fillna("Bedsitter").astype("category")
+        )
         if missing_count > 0:
-            self.df.loc[self.df["house_type"].isna(), "house_type"] = "Bedsitter"
             self._log(
                 f"✅ Filled {missing_count} missing house_type values with 'Bedsitter'"
             )
@@ -53,19 +206,43 @@ class DataCleaner:
                 f"🗑️ Dropped {rows_dropped} rows with missing bathroom/bedroom data"
             )
 
-        # Extract numeric values (e.g., '2 Bathrooms' -> '2')
-        self.df["bathrooms"] = (
-            self.df["bathrooms"].str.split(" ").str.get(0).str.strip()
-        )
-        self.df["bedrooms"] = self.df["bedrooms"].str.split(" ").str.get(0).str.strip()
+        # Extract numeric values (e.g., '2 Bathrooms' -> 2)
+        for col in ("bathrooms", "bedrooms"):
+            self.df[col] = self._parse_unique(
+                self.df[col],
+                lambda s: s.astype("string")
+                .str.extract(r"^\s*(\d+)", expand=False)
+                .astype("Int16"),
+            )
         self._log("✅ Cleaned bathrooms and bedrooms successfully")
         return self
 
+    @staticmethod
+    def _parse_unique(values, parse):
+        """Run a vectorized parser once per distinct value and broadcast back."""
+        codes, uniques = pd.factorize(values)
+        parsed = parse(pd.Series(uniques, dtype=values.dtype))
+        return pd.Series(parsed.array.take(codes, allow_fill=True), index=values.index)
+
+    @staticmethod
+    def _parse_properties(raw):
+        """Parse a scraped properties dict, trying the C JSON parser first."""
+        if not isinstance(raw, str):
+            return {}
+        try:
+            return json.loads(raw.replace("'", '"'))
+        except ValueError:
+            return ast.literal_eval(raw)
+
     def extract_properties(self):
         self._log("🏗️ Extracting property attributes...")
         initial_columns = len(self.df.columns)
-        self.df["properties"] = self.df["properties"].apply(ast.literal_eval)
-        properties = self.df["properties"].apply(pd.Series)
+        self.df["properties"] = [
+            self._parse_properties(raw) for raw in self.df["properties"]
+        ]
+        properties = pd.DataFrame(self.df["properties"].tolist(), index=self.df.index)
+        categorical = properties.columns.intersection(["Condition", "Furnishing"])
+        properties = properties.astype(dict.fromkeys(categorical, "category"))
         self.df = self.df.join(properties)
         if not self.keep_original_columns:
             self.df = self.df.drop("properties", axis=1)
@@ -74,11 +251,23 @@ class DataCleaner:
         self._log(f"✅ Properties extracted: added {new_columns} new attributes!")
         return self
 
+    @staticmethod
+    def _one_hot(values, vocabulary, sep=","):
+        """One-hot encode delimited strings straight into a uint8 matrix."""
+        tokens = values.reset_index(drop=True).str.split(sep).explode()
+        # An all-missing column explodes to float NaN
+        tokens = tokens.astype("string").str.strip()
+        tokens = tokens[tokens.isin(vocabulary)]
+        codes, columns = pd.factorize(tokens, sort=True)
+        matrix = np.zeros((len(values), len(columns)), dtype=np.uint8)
+        matrix[tokens.index.to_numpy(), codes] = 1
+        return pd.DataFrame(matrix, index=values.index, columns=columns)
+
     def extract_amenities(self):
         self._log("🛋️ Extracting amenities...")
         initial_columns = len(self.df.columns)
-        amenities_encoded = self.df["amenities"].str.strip().str.get_dummies(sep=",")
-        amenities_encoded.columns = amenities_encoded.columns.str.strip()
+        amenities_encoded = self._one_hot(self.df["amenities"], self.dummy_vocabulary)
+        self.dummy_columns.update(amenities_encoded.columns)
         self.df = self.df.join(amenities_encoded)
         if not self.keep_original_columns:
             self.df = self.df.drop("amenities", axis=1)
@@ -97,22 +286,18 @@ class DataCleaner:
         self._log("🏢 Extracting and merging facilities...")
 
         # 1. Generate dummies from the Facilities column
-        facilities_encoded = self.df["Facilities"].str.strip().str.get_dummies(sep=",")
-        facilities_encoded.columns = facilities_encoded.columns.str.strip()
-
-        # 2. Logical Merge: Handle duplicates manually to avoid Reindex errors
-        for col in facilities_encoded.columns:
-            if col in self.df.columns:
-                # If column exists, combine them (1 if either is 1)
-                # We use .max(axis=1) or logical OR to handle the merge
-                self.df[col] = (
-                    self.df[[col]]
-                    .join(facilities_encoded[[col]], rsuffix="_new")
-                    .max(axis=1)
-                )
-            else:
-                # If brand new, just add it
-                self.df[col] = facilities_encoded[col]
+        facilities_encoded = self._one_hot(self.df["Facilities"], self.dummy_vocabulary)
+        self.dummy_columns.update(facilities_encoded.columns)
+
+        # 2. Logical Merge: OR into existing columns, join the brand new ones
+        overlap = facilities_encoded.columns.intersection(self.df.columns)
+        new = facilities_encoded.columns.difference(self.df.columns, sort=False)
+        if len(overlap):
+            self.df[overlap] = np.maximum(
+                self.df[overlap].to_numpy(np.uint8),
+                facilities_encoded[overlap].to_numpy(),
+            )
+        self.df = self.df.join(facilities_encoded[new])
 
         if not self.keep_original_columns:
             self.df = self.df.drop("Facilities", axis=1)
@@ -123,117 +308,28 @@ class DataCleaner:
 
     def clean_price(self):
         self._log("💰 Cleaning price data...")
-        self.df["price"] = (
-            self.df["price"]
-            .str.replace("GH₵ ", "", regex=False)
-            .str.replace(",", "", regex=False)
-            .astype(float)
+        self.df["price"] = self._parse_unique(
+            self.df["price"],
+            lambda s: s.str.replace(r"GH₵\s*|,", "", regex=True).astype(float),
         )
         return self
 
     def remove_sale_and_short_term(self):
         self._log("🚫 Filtering out sale and short-term rental listings...")
-        sale_patterns = [
-            "for sale",
-            "on sale",
-            "sale",
-            "sale only",
-            "selling",
-            "sell",
-            "sold",
-            "property for sale",
-            "house for sale",
-            "apartment for sale",
-            "buy",
-            "buyer",
-            "title deed",
-            "deed",
-            "closing",
-            "escrow",
-            "transfer",
-            "down payment",
-            "mortgage",
-            "loan",
-            "financing",
-            "cash only",
-            "investment",
-            "roi",
-            "yield",
-            "capital gain",
-            "airbnb",
-            "air bnb",
-            "booking.com",
-            "vrbo",
-            "short stay",
-            "holiday rental",
-            "vacation rental",
-            "tourist rental",
-            "guesthouse",
-            "guest house",
-        ]
-        period_patterns = [
-            "per night",
-            "nightly",
-            "per day",
-            "daily",
-            "by the day",
-            "short term",
-            "short-term",
-            "weekly",
-            "per week",
-            "weekend",
-            "airbnb",
-            "air bnb",
-            "business short",
-            "holidays",
-        ]
-
-        combined_patterns = sale_patterns + period_patterns
-        regex = "|".join([re.escape(p) for p in combined_patterns])
-
-        text = (
-            self.df["title"].fillna("") + " " + self.df["description"].fillna("")
-        ).str.lower()
-
         initial_rows = len(self.df)
-        self.df = self.df[~text.str.contains(regex, regex=True, na=False)]
+        remove = np.zeros(len(self.df), dtype=bool)
+        for col in ("title", "description"):
+            # An all-missing column reads as float NaN without the .str accessor
+            text = self.df[col].astype("string")
+            remove |= text.str.contains(EXCLUDE_RE, na=False).to_numpy(bool)
+        self.df = self.df.take(np.flatnonzero(~remove))
         self._log(f"🗑️ Removed {initial_rows - len(self.df)} non-rental listings")
         return self
 
     def select_columns(self):
         self._log("📋 Selecting final relevant columns...")
-        selected_cols = [
-            "url",
-            "fetch_date",
-            "house_type",
-            "bathrooms",
-            "bedrooms",
-            "price",
-            "locality",
-            "Condition",
-            "Furnishing",
-            "Property Size",
-            "24-hour Electricity",
-            "Air Conditioning",
-            "Apartment",
-            "Balcony",
-            "Chandelier",
-            "Dining Area",
-            "Dishwasher",
-            "Hot Water",
-            "Kitchen Cabinets",
-            "Kitchen Shelf",
-            "Microwave",
-            "Pop Ceiling",
-            "Pre-Paid Meter",
-            "Refrigerator",
-            "TV",
-            "Tiled Floor",
-            "Wardrobe",
-            "Wi-Fi",
-        ]
-        available_cols = [col for col in selected_cols if col in self.df.columns]
-        self.df = self.df[available_cols].copy()
+        available_cols = self.output_columns.intersection(self.df.columns, sort=False)
+        self.df = self.df.reindex(columns=available_cols)
         self._log(
             f"✅ Final dataset: {len(available_cols)} columns, {len(self.df)} rows"
         )
@@ -241,40 +337,58 @@ class DataCleaner:
 
     def clean_locality(self):
         self._log("📍 Cleaning Locality...")
-        init_len = self.df["locality"].nunique()
-        replacements = {
-            "Dworwulu": "Dzorwulu",
-            "Lartebiokoshie": "Lartebiokorshie",
-            "Ashongman Estate": "Ashongman",
-            "Ashoman Estate": "Ashongman",
-            "Old Ashongman": "Ashongman",
-            "Old Ashoman": "Ashongman",
-            "Ashoman": "Ashongman",
-            "Greater Accra": "Other",
-            "Ledzokuku-Krowor": "Teshie",
-            "South Shiashie": "East Legon",
-            "Okponglo": "East Legon",
-            "Little Legon": "East Legon",
-            "Abofu": "Achimota",
-            "Akweteyman": "Achimota",
-            "Banana Inn": "Dansoman",
-            "South La": "Labadi",
-            "Bubuashie": "Kaneshie",
-        }
-        self.df["locality"] = self.df["locality"].replace(replacements)
-        rep2 = {
-            "Circle": "Nkrumah Circle",
-            "Anyaa": "Anyaa Market",
-            "Ridge": "Greater Accra Regional Hospital",
-            "Dome": "Dome Market",
-            "Abokobi": "Abokobi Station",
-            "Nungua": "Nungua Central",
-            "Greater Accra": "Accra",
-        }
-        self.df["loc"] = self.df["locality"].replace(rep2)
-        fin_len = self.df["locality"].nunique()
-        self._log(f"✅ Reduced locality from {init_len} to {fin_len}")
+        init_len = self.df["locality"].nunique() if self.verbose else None
+        self.df["locality"] = self.df["locality"].replace(self.locality_replacements)
+        self.df["loc"] = self.df["locality"].replace(self.loc_replacements)
+        # Cast only after the replacements; replace() on categoricals is deprecated
+        for col in ("locality", "loc"):
+            self.df[col] = self.df[col].astype("category")
+        if self.verbose:
+            fin_len = self.df["locality"].nunique()
+            self._log(f"✅ Reduced locality from {init_len} to {fin_len}")
         return self
 
     def get_df(self):
         return self.df
+
+    def clean_all(self):
+        return (
+            self.clean_bathrooms_bedrooms()
+            .remove_sale_and_short_term()
+            .extract_sub_location()
+            .fill_missing_house_type()
+            .extract_properties()
+            .extract_amenities()
+            .extract_facilities()
+            .clean_price()
+            .select_columns()
+            .clean_locality()
+            .get_df()
+        )
+
+    @classmethod
+    def clean_csv(cls, path, chunksize=50_000, **kwargs):
+        """Clean a CSV chunk by chunk instead of loading it into memory at once."""
+        frames, dummy_columns = [], set()
+        reader = pd.read_csv(
+            path,
+            chunksize=chunksize,
+            usecols=lambda col: col in cls.input_columns,
+            dtype=str,
+        )
+        for chunk in reader:
+            cleaner = cls(chunk, copy=False, **kwargs)
+            frames.append(cleaner.clean_all())
+            dummy_columns |= cleaner.dummy_columns
+
+        df = pd.concat(frames, ignore_index=True)
+        # concat orders columns by first appearance in the chunks
+        df = df.reindex(
+            columns=[*cls.output_columns.intersection(df.columns, sort=False), "loc"]
+        )
+        dummies = df.columns.intersection(list(dummy_columns))
+        df[dummies] = df[dummies].fillna(0).astype(np.uint8)
+        # Categoricals with differing categories across chunks concat to object
+        for col in df.columns.intersection(cls.categorical_columns):
+            df[col] = df[col].astype("category")
+        return df